@@ -1,14 +1,19 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, Response
 import pandas as pd
 import numpy as np
 from together import Together
 from sklearn.metrics.pairwise import cosine_similarity
 import os
-from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Literal, Dict
 import re
 import json
+import time
+import threading
+from collections import OrderedDict
+from chat_store import ChatStore, format_chat_history, normalize_chat_history
+from fast_answer import FastAnswerTier
+from shared_store import SHARED_STORE_ENV, SharedAlertStore, load_alert_store
 
 # Check for Together AI API key
 if 'TOGETHER_API_KEY' not in os.environ:
@@ -19,19 +24,145 @@ if 'TOGETHER_API_KEY' not in os.environ:
 
 app = Flask(__name__)
 
+# Routing mode: "two_call" classifies the query first and then answers it,
+# "one_shot" lets the model pick the route and answer in a single completion
+ROUTING_MODE = os.environ.get('ROUTING_MODE', 'two_call')
+ROUTING_MODES = ('two_call', 'one_shot')
+
+SOURCE_URLS = {
+    'Macquarie Bank': 'https://www.macquarie.com.au/security-and-fraud/scams/latest-scams-alerts.html',
+    'CommBank': 'https://www.commbank.com.au/support/security/latest-scams-and-security-alerts.html'
+}
+
+# The tag may be wrapped in markdown or follow a short preamble, so it is searched for, not anchored
+ROUTE_TAG_PATTERN = re.compile(r'\**\[ROUTE:\s*(company_check|situation_analysis)\s*\]\**')
+# How much of a one-shot reply is buffered while looking for the route tag
+ROUTE_TAG_WINDOW = 120
+
+# Prompt sections shared by the route handlers and the one-shot prompt
+COMPANY_FOCUS = """1. Whether the specified company (including its full name and acronym, if provided) has been involved in known scams.
+            2. Similar company names used in scams
+            3. **If a company or similar name is found in the database, explicitly include the corresponding Source URL in the response.**
+            4. Whether there is information about the company in the context, still ask the user to provide more information, 
+            so that you can verifying key legitimacy factors **one item at a time** if it has not been mentioned in the context"""
+
+SITUATION_FOCUS = """1. Identifying potential scam patterns 
+            2. Similar known scam cases
+            3. Verifying key legitimacy factors **one item at a time** if it has not been mentioned in the context"""
+
+LEGITIMACY_FACTORS = """- Does the business provide a verifiable **physical address**?
+                - Has the business been **featured in reputable sources** (e.g., government databases, trusted review sites, financial institutions)?
+                - What **financial returns** does the business claim, and do they use word such as "guaranteed" or "risk free"?"""
+
+DATABASE_CONTEXT_NOTE = """IMPORTANT: The following context information comes from the bot's database, NOT from the user. 
+            Do not say "based on the information you provided" or similar phrases. Instead, refer to it as 
+            "based on my database" or "according to my records"."""
+
 class RoutingAgent:
-    def __init__(self, chatbot):
+    def __init__(self, chatbot, mode=ROUTING_MODE):
+        if mode not in ROUTING_MODES:
+            raise ValueError(f"Unknown routing mode '{mode}', expected one of {ROUTING_MODES}")
         self.chatbot = chatbot
+        self.mode = mode
         self.routes = {
             "company_check": "Route for verifying specific company mentions using RAG",
             "situation_analysis": "Route for analyzing user's situation with expert knowledge"
         }
+        # Per-mode counters so the two routing modes can be compared side by side
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            mode_name: {
+                "requests": 0,
+                "llm_calls": 0,
+                "total_tokens": 0,
+                "total_latency_s": 0.0,
+                "total_first_token_s": 0.0,
+                # "untagged" counts one-shot replies where the model left out the route tag
+                "routes": dict({route: 0 for route in self.routes}, untagged=0)
+            }
+            for mode_name in ROUTING_MODES
+        }
+
+    def _record(self, mode, llm_calls=0, tokens=0, route=None, latency=None, first_token=None):
+        """Accumulate routing statistics for the given mode"""
+        with self._stats_lock:
+            stats = self.stats[mode]
+            stats["llm_calls"] += llm_calls
+            stats["total_tokens"] += tokens
+            if route is not None:
+                stats["requests"] += 1
+                stats["routes"][route] += 1
+            if latency is not None:
+                stats["total_latency_s"] += latency
+            if first_token is not None:
+                stats["total_first_token_s"] += first_token
+
+    def get_stats(self):
+        """Return a snapshot of the routing statistics with per-request averages"""
+        with self._stats_lock:
+            snapshot = {}
+            for mode_name, stats in self.stats.items():
+                requests = stats["requests"] or 1
+                snapshot[mode_name] = dict(
+                    stats,
+                    routes=dict(stats["routes"]),
+                    avg_llm_calls=stats["llm_calls"] / requests,
+                    avg_tokens=stats["total_tokens"] / requests,
+                    avg_latency_s=stats["total_latency_s"] / requests,
+                    avg_first_token_s=stats["total_first_token_s"] / requests
+                )
+            return snapshot
+
+    @staticmethod
+    def _usage_tokens(obj):
+        """Return total token usage reported on a completion or stream chunk, if any"""
+        usage = getattr(obj, 'usage', None)
+        return getattr(usage, 'total_tokens', 0) or 0
+
+    def _iter_text(self, response, mode, route, started, llm_calls=0, tokens=0):
+        """
+        Yield the text of a streamed completion while recording its statistics.
+        Nothing is recorded unless the stream completes, so failed requests don't skew the averages.
+        """
+        stream_tokens = 0
+        first_token = None
+        for chunk in response:
+            stream_tokens = self._usage_tokens(chunk) or stream_tokens
+            if hasattr(chunk, 'choices') and len(chunk.choices) > 0:
+                if hasattr(chunk.choices[0], 'delta') and hasattr(chunk.choices[0].delta, 'content'):
+                    if chunk.choices[0].delta.content is not None:
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+                        yield chunk.choices[0].delta.content
+        self._record(mode, llm_calls=llm_calls, tokens=tokens + stream_tokens, route=route,
+                     latency=time.perf_counter() - started, first_token=first_token)
+
+    def _format_context_items(self, relevant_info):
+        """Format retrieved scam alerts into context entries for the prompt"""
+        context_items = []
+        for _, row in relevant_info.iterrows():
+            source = row.get('Source', 'Source not available')
+            source_url = SOURCE_URLS.get(source, source)
+
+            context_items.append(
+                f"Source_url: {source_url}\n"
+                f"Title: {row.get('Title', '')}\n"
+                f"Content: {row.get('Content', '')}"
+            )
+        return context_items
         
     def detect_company_name_llm(self, text):
         """
         Use LLM to detect if a company name is mentioned in the text
         Returns: 1 if company name found, 0 if not
         """
+        return self._detect_company(text)[0]
+
+    def _detect_company(self, text):
+        """
+        Run the company detection call
+        Returns: (1 or 0, total tokens used), tokens is None if the call failed
+        """
         messages = [
             {"role": "system", "content": """You are a company name detection expert. 
             Analyze the text and respond ONLY with a JSON object in this exact format:
@@ -53,36 +184,142 @@ class RoutingAgent:
                 stop=["<|eot_id|>", "<|eom_id|>"]
             )
             
+            tokens = self._usage_tokens(response)
             content = response.choices[0].message.content.strip()
             if not content:
-                return 0
+                return 0, tokens
                 
             try:
                 result = json.loads(content)
-                return result.get("has_company", 0)
+                return result.get("has_company", 0), tokens
             except json.JSONDecodeError:
-                return 0
+                return 0, tokens
                 
         except Exception as e:
             print(f"LLM detection error: {str(e)}")
-            return 0
+            return 0, None
             
-    def route_query(self, query):
+    def route_query(self, query, mode=None):
         """Route the query to appropriate handler based on content"""
+        mode = mode or self.mode
+        if mode == 'one_shot':
+            return self.route_query_one_shot(query)
+
         print("\n=== Routing Agent Analysis ===")
         print(f"Query: {query}")
+        started = time.perf_counter()
         
         # Use LLM to detect if query mentions a company
-        llm_result = self.detect_company_name_llm(query)
+        llm_result, detection_tokens = self._detect_company(query)
         print(f"LLM Detection Result: {llm_result}")
         
         # Route to appropriate handler based on detection
         if llm_result == 1:
             print("\n✓ Routing to company handler")
-            return self._handle_company_query(query)
+            route = "company_check"
+            response = self._handle_company_query(query)
         else:
             print("\n✓ Routing to situation analysis")
-            return self._handle_situation_query(query)
+            route = "situation_analysis"
+            response = self._handle_situation_query(query)
+
+        if isinstance(response, str):
+            return response
+        # The detection call is only counted once the answer has streamed successfully
+        detection_calls = 0 if detection_tokens is None else 1
+        return self._iter_text(response, 'two_call', route, started,
+                               llm_calls=detection_calls + 1, tokens=detection_tokens or 0)
+
+    def route_query_one_shot(self, query):
+        """
+        Pick the route and answer the query in a single streamed completion.
+        The model opens its reply with a route tag which is stripped from the stream.
+        """
+        print("\n=== Routing Agent Analysis (one-shot) ===")
+        print(f"Query: {query}")
+        started = time.perf_counter()
+
+        # Both handlers share the same retrieval, so fetch it once for the combined prompt
+        relevant_info = self.chatbot.find_relevant_content(query)
+        context_items = self._format_context_items(relevant_info)
+        context = "\n\n".join(context_items)
+        # The situation handler is the only one given the extra knowledge, so keep it under that route
+        extra_knowledge = ""
+        if self.chatbot.extra_knowledge:
+            extra_knowledge = f"""
+            Additional Scam Knowledge (use only for situation_analysis):
+            {self.chatbot.extra_knowledge}
+"""
+
+        messages = [
+            self.chatbot.system_message,
+            {"role": "user", "content": f"""First decide which route applies to this message: {query}
+
+            Start your reply with exactly one of these tags on its own line, then write your answer:
+            [ROUTE: company_check] - a proper company name is mentioned (just the word 'company' without a proper name does not count)
+            [ROUTE: situation_analysis] - no company name is mentioned
+
+            If the route is company_check, focus on:
+            {COMPANY_FOCUS}.
+
+            If the route is situation_analysis, focus on:
+            {SITUATION_FOCUS}.
+{extra_knowledge}
+            Key legitimacy factors:
+                {LEGITIMACY_FACTORS}
+
+            {DATABASE_CONTEXT_NOTE}
+
+            Context:
+            {context}"""}
+        ]
+
+        try:
+            response = self.chatbot.client.chat.completions.create(
+                model="meta-llama/Llama-3.3-70B-Instruct-Turbo",
+                messages=messages,
+                max_tokens=520,
+                temperature=0.3,
+                stream=True
+            )
+        except Exception as e:
+            print(f"Error generating response: {str(e)}")
+            return "I apologize, but I encountered an error while processing your query."
+
+        return self._strip_route_tag(response, started)
+
+    def _strip_route_tag(self, response, started):
+        """Parse the route tag out of the first tokens of a one-shot stream"""
+        route = None
+        buffer = ''
+        emitted = False
+        stream = self._iter_text(response, 'one_shot', None, started, llm_calls=1)
+        for text in stream:
+            if route is None:
+                buffer += text
+                match = ROUTE_TAG_PATTERN.search(buffer)
+                if match:
+                    route = match.group(1)
+                    text = buffer[:match.start()] + buffer[match.end():]
+                elif len(buffer) > ROUTE_TAG_WINDOW:
+                    # The model left out the tag, pass the reply through as it is
+                    route = "untagged"
+                    text = buffer
+                else:
+                    continue
+                print(f"\n✓ One-shot route: {route}")
+            if not emitted:
+                # Drop the whitespace left around the tag before the first visible text
+                text = text.lstrip()
+                if not text:
+                    continue
+                emitted = True
+            yield text
+        if route is None:
+            route = "untagged"
+            if buffer.strip():
+                yield buffer.strip()
+        self._record('one_shot', route=route)
     
     def _handle_company_query(self, query):
         """Handle queries about specific companies"""
@@ -90,23 +327,9 @@ class RoutingAgent:
         relevant_info = self.chatbot.find_relevant_content(query)
         
         # Format context from relevant information
-        context_items = []
-        for _, row in relevant_info.iterrows():
-            source = row.get('Source', 'Source not available')
-
-            # Update source URL based on source name
-            if source == 'Macquarie Bank':
-                source_url = 'https://www.macquarie.com.au/security-and-fraud/scams/latest-scams-alerts.html'
-            elif source == 'CommBank':
-                source_url = 'https://www.commbank.com.au/support/security/latest-scams-and-security-alerts.html'
-            
-            context_items.append(
-                f"Source_url: {source_url}\n"
-                f"Title: {row.get('Title', '')}\n"
-                f"Content: {row.get('Content', '')}"
-            )
+        context_items = self._format_context_items(relevant_info)
         
-        context = "n\n".join(context_items)
+        context = "\n\n".join(context_items)
         
         # Company-specific prompt
         messages = [
@@ -114,19 +337,10 @@ class RoutingAgent:
             {"role": "user", "content": f"""Please analyze this query about the company: {query}
 
             Focus on:
+            {COMPANY_FOCUS}, including:
+                {LEGITIMACY_FACTORS}
 
-            1. Whether the specified company (including its full name and acronym, if provided) has been involved in known scams.
-            2. Similar company names used in scams
-            3. **If a company or similar name is found in the database, explicitly include the corresponding Source URL in the response.**
-            4. Whether there is information about the company in the context, still ask the user to provide more information, 
-            so that you can verifying key legitimacy factors **one item at a time** if it has not been mentioned in the context, including:
-                - Does the business provide a verifiable **physical address**?
-                - Has the business been **featured in reputable sources** (e.g., government databases, trusted review sites, financial institutions)?
-                - What **financial returns** does the business claim, and do they use word such as "guaranteed" or "risk free"?
-
-            IMPORTANT: The following context information comes from the bot's database, NOT from the user. 
-            Do not say "based on the information you provided" or similar phrases. Instead, refer to it as 
-            "based on my database" or "according to my records".
+            {DATABASE_CONTEXT_NOTE}
 
             Context:
             {context}"""}
@@ -152,20 +366,7 @@ class RoutingAgent:
         # Use RAG for general scam patterns
         relevant_info = self.chatbot.find_relevant_content(query)
         # Format context from relevant information
-        context_items = []
-        for _, row in relevant_info.iterrows():
-            source = row.get('Source', 'Source not available')
-
-            if source == 'Macquarie Bank':
-                source_url = 'https://www.macquarie.com.au/security-and-fraud/scams/latest-scams-alerts.html'
-            elif source == 'CommBank':
-                source_url = 'https://www.commbank.com.au/support/security/latest-scams-and-security-alerts.html'
-
-            context_items.append(
-                f"Source_url: {source_url}\n"
-                f"Title: {row.get('Title', '')}\n"
-                f"Content: {row.get('Content', '')}"
-            )
+        context_items = self._format_context_items(relevant_info)
         
         # Add extra scam knowledge to context
         if self.chatbot.extra_knowledge:
@@ -179,16 +380,10 @@ class RoutingAgent:
             {"role": "user", "content": f"""Please analyze this situation: {query}
 
             Focus on:
-            1. Identifying potential scam patterns 
-            2. Similar known scam cases
-            3. Verifying key legitimacy factors **one item at a time** if it has not been mentioned in the context, including:
-                - Does the business provide a verifiable **physical address**?
-                - Has the business been **featured in reputable sources** (e.g., government databases, trusted review sites, financial institutions)?
-                - What **financial returns** does the business claim, and do they use word such as "guaranteed" or "risk free"?
+            {SITUATION_FOCUS}, including:
+                {LEGITIMACY_FACTORS}
 
-            IMPORTANT: The following context information comes from the bot's database, NOT from the user. 
-            Do not say "based on the information you provided" or similar phrases. Instead, refer to it as 
-            "according to my records".
+            {DATABASE_CONTEXT_NOTE}
 
             Context:
             {context}"""}
@@ -210,14 +405,21 @@ class RoutingAgent:
 
 class ScamChatbot:
     def __init__(self):
-        self.client = Together()
-        # Load the original scam alerts data
-        self.scam_data = pd.read_csv('Data/scam_alerts.csv')
-        # Load the embeddings
-        self.embeddings_data = pd.read_csv('Data/scam_alerts_embeddings.csv')
-        # Convert string representation of embeddings back to numpy arrays
-        self.embeddings_data['embedding'] = self.embeddings_data['embedding'].apply(eval)
-        self.embeddings_matrix = np.array(self.embeddings_data['embedding'].tolist())
+        # The Together client is created on first use, so workers boot without it
+        self._client = None
+        self._client_lock = threading.Lock()
+        shared_prefix = os.environ.get(SHARED_STORE_ENV)
+        if shared_prefix:
+            # Attach to the alert store published by the gunicorn master
+            # Alert rows are read from shared memory per query, so no per-worker frames are built
+            self.shared_store = SharedAlertStore.attach(shared_prefix)
+            self.scam_data = None
+            self.embeddings_data = None
+            self.embeddings_matrix = self.shared_store.embeddings_matrix
+        else:
+            # Load the scam alerts data and the embeddings
+            self.shared_store = None
+            self.scam_data, self.embeddings_data, self.embeddings_matrix = load_alert_store()
         # Load additional scam knowledge
         try:
             with open('Data/Extra_Scam_Knowledge/extra_scam_related_knowledge.txt', 'r') as f:
@@ -234,16 +436,43 @@ class ScamChatbot:
             Guidelines for your responses:
             1. Keep responses concise and conversational"""
         }
+        # Recent query embeddings, shared by the fast answer tier and retrieval
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_size = 256
+        self._embedding_lock = threading.Lock()
         # Initialize the routing agent
         self.router = RoutingAgent(self)
+        # Initialize the fast answer tier for canned intents
+        self.fast_answers = FastAnswerTier(
+            self,
+            intents_path=os.environ.get('FAST_ANSWER_INTENTS', 'Data/canned_intents.json'),
+            fuzzy_threshold=float(os.environ.get('FAST_ANSWER_FUZZY_THRESHOLD', '0.97')),
+            semantic_threshold=float(os.environ.get('FAST_ANSWER_SEMANTIC_THRESHOLD', '0.92'))
+        )
+
+    @property
+    def client(self):
+        with self._client_lock:
+            if self._client is None:
+                self._client = Together()
+            return self._client
 
     def get_embedding(self, text):
         """Create embedding for the input text"""
+        with self._embedding_lock:
+            if text in self._embedding_cache:
+                self._embedding_cache.move_to_end(text)
+                return self._embedding_cache[text]
         response = self.client.embeddings.create(
             model="togethercomputer/m2-bert-80M-2k-retrieval",
             input=text
         )
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
+        with self._embedding_lock:
+            self._embedding_cache[text] = embedding
+            if len(self._embedding_cache) > self._embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+        return embedding
 
     def find_relevant_content(self, query, top_k=5):
         """Find the most relevant content based on the query"""
@@ -256,6 +485,10 @@ class ScamChatbot:
         # Get top k indices
         top_indices = np.argsort(similarities)[-top_k:][::-1]
         
+        if self.shared_store is not None:
+            # Shared alert rows are aligned with the embeddings, keep the file order like below
+            return self.shared_store.take(sorted(top_indices))
+        
         # Get corresponding Intel_IDs
         relevant_intel_ids = self.embeddings_data.iloc[top_indices]['Intel_ID'].tolist()
         
@@ -264,9 +497,20 @@ class ScamChatbot:
         
         return relevant_contents
 
-    def generate_response(self, query):
-        """Generate response using the routing agent"""
-        return self.router.route_query(query)
+    def generate_response(self, query, routing_mode=None, boilerplate_checked=False):
+        """Generate response using the fast answer tier, falling back to the routing agent"""
+        # The frontend already ran the fuzzy check through /get-boilerplate-response
+        fast_answer = self.fast_answers.answer(query, fuzzy=not boilerplate_checked,
+                                               count_lookup=not boilerplate_checked)
+        if fast_answer is not None:
+            return fast_answer
+        return self.router.route_query(query, mode=routing_mode)
+
+# Initialize the chat history store
+chat_store = ChatStore(
+    path=os.environ.get('CHAT_STORE_PATH', 'chat_histories/chat_histories.db'),
+    retention_days=int(os.environ.get('CHAT_RETENTION_DAYS', '30'))
+)
 
 # Initialize the chatbot
 try:
@@ -284,22 +528,22 @@ def home():
 def chat():
     data = request.json
     user_message = data.get('message', '')
+    # Optional per-request override, used to compare the routing modes
+    routing_mode = data.get('routing_mode')
+    if routing_mode is not None and routing_mode not in ROUTING_MODES:
+        return jsonify({'response': f'Error: unknown routing mode {routing_mode}'}), 400
     
     try:
         # Get response from the chatbot
-        response = chatbot.generate_response(user_message)
+        response = chatbot.generate_response(user_message, routing_mode=routing_mode,
+                                             boilerplate_checked=bool(data.get('boilerplate_checked')))
         
         # Check if response is a string (error message)
         if isinstance(response, str):
             return jsonify({'response': response})
             
         # Collect the response text
-        response_text = ''
-        for chunk in response:
-            if hasattr(chunk, 'choices') and len(chunk.choices) > 0:
-                if hasattr(chunk.choices[0], 'delta') and hasattr(chunk.choices[0].delta, 'content'):
-                    if chunk.choices[0].delta.content is not None:
-                        response_text += chunk.choices[0].delta.content
+        response_text = ''.join(response)
         
         # If we didn't get any text, return an error
         if not response_text:
@@ -319,54 +563,56 @@ def reset():
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def _download_response(lines, conversation_id):
+    """Stream a plain text chat history to the client as a file download"""
+    filename = f"chat_history_{conversation_id}.txt"
+    return Response(
+        lines,
+        mimetype='text/plain; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
 @app.route('/save-chat', methods=['POST'])
 def save_chat():
     try:
         data = request.json
-        chat_history = data.get('chatHistory', [])
-        
-        # Create a timestamp for the filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"chat_history_{timestamp}.txt"
-        
-        # Create 'chat_histories' directory if it doesn't exist
-        if not os.path.exists('chat_histories'):
-            os.makedirs('chat_histories')
-        
-        # Write chat history to file
-        filepath = os.path.join('chat_histories', filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for message in chat_history:
-                role = "User" if message['isUser'] else "Bot"
-                f.write(f"{role}: {message['text']}\n\n")
+        try:
+            messages = normalize_chat_history(data.get('chatHistory', []))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Return the file for download
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        # Store the conversation in the background and stream the export straight back
+        conversation_id = chat_store.append(messages)
+        return _download_response(format_chat_history(messages), conversation_id)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    routing_stats = chatbot.router.get_stats()
+    return jsonify({
+        'routing_mode': chatbot.router.mode,
+        'routing': routing_stats,
+        'fast_answer': chatbot.fast_answers.get_stats(
+            llm_latency_s=routing_stats[chatbot.router.mode]['avg_latency_s']
+        )
+    })
+
 @app.route('/get-prompts', methods=['GET'])
 def get_prompts():
-    prompts = [
-        "I heard this good investment opportunity from a company, can you help me to check if any institution has warned about it?",
-        "I'm not sure if this is a scam, can you help me check if the pattern look like a scam?"
-    ]
-    return jsonify({'prompts': prompts})
+    return jsonify({'prompts': chatbot.fast_answers.prompts})
 
 @app.route('/get-boilerplate-response', methods=['POST'])
 def get_boilerplate_response():
     data = request.json
-    prompt = data.get('prompt', '')
-    
-    # Define boilerplate responses for specific prompts
-    boilerplate_responses = {
-        "I heard this good investment opportunity from a company, can you help me to check if any institution has warned about it?": 
-            "Sure, would you be able to tell the name of the company?"
-    }
+    prompt = data.get('prompt')
+    if not isinstance(prompt, str):
+        return jsonify({'is_boilerplate': False})
     
-    # Check if the prompt has a boilerplate response
-    if prompt in boilerplate_responses:
-        return jsonify({'response': boilerplate_responses[prompt], 'is_boilerplate': True})
+    # Only the cheap fuzzy match runs here, /chat runs the embedding match on a miss
+    response = chatbot.fast_answers.answer(prompt, semantic=False)
+    if response is not None:
+        return jsonify({'response': response, 'is_boilerplate': True})
     else:
         return jsonify({'is_boilerplate': False})
 
@@ -0,0 +1,186 @@
+"""
+Local stand-in for the Together AI API with tunable latency, used by the load test.
+Point the app at it with TOGETHER_BASE_URL=http://127.0.0.1:<port>/v1
+
+Run standalone:
+    python benchmarks/fake_together_server.py --port 8099 --first-token-latency 0.5 --token-latency 0.02
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBEDDING_SIZE = 768
+ANSWER_WORDS = (
+    "This looks like a common investment scam pattern . According to my records , scammers often promise "
+    "guaranteed returns and pressure you to act quickly . Could you tell me whether the business provides "
+    "a verifiable physical address ?"
+).split()
+
+
+def fake_embedding(text):
+    """Deterministic pseudo-random embedding so repeated queries map to the same vector"""
+    seed = int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    return [rng.uniform(-0.25, 0.25) for _ in range(EMBEDDING_SIZE)]
+
+
+class FakeTogetherServer:
+    """Threaded HTTP server answering the embeddings and chat completions endpoints"""
+
+    def __init__(self, host='127.0.0.1', port=0, first_token_latency=0.5, token_latency=0.02,
+                 embedding_latency=0.05, answer_tokens=120, company_ratio=0.5):
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.embedding_latency = embedding_latency
+        self.answer_tokens = answer_tokens
+        self.company_ratio = company_ratio
+        self.requests = {'embeddings': 0, 'chat': 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-together', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, kind):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def _has_company(self, text):
+        """Stable per-message choice so the same message is always routed the same way"""
+        digest = int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+        return 1 if (digest % 1000) / 1000 < self.company_ratio else 0
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                if self.path.endswith('/embeddings'):
+                    self._embeddings(payload)
+                elif self.path.endswith('/chat/completions'):
+                    self._chat(payload)
+                else:
+                    self.send_error(404)
+
+            def _embeddings(self, payload):
+                fake._count('embeddings')
+                time.sleep(fake.embedding_latency)
+                inputs = payload.get('input', '')
+                if isinstance(inputs, str):
+                    inputs = [inputs]
+                self._send_json({
+                    'object': 'list',
+                    'model': payload.get('model'),
+                    'data': [
+                        {'object': 'embedding', 'index': i, 'embedding': fake_embedding(text)}
+                        for i, text in enumerate(inputs)
+                    ]
+                })
+
+            def _chat(self, payload):
+                fake._count('chat')
+                messages = payload.get('messages', [])
+                prompt = messages[-1].get('content', '') if messages else ''
+                prompt_tokens = sum(len(m.get('content', '').split()) for m in messages)
+
+                if not payload.get('stream'):
+                    # Company detection call, answered as a single JSON object
+                    time.sleep(fake.first_token_latency)
+                    content = json.dumps({'has_company': fake._has_company(prompt)})
+                    self._send_json({
+                        'id': 'fake', 'object': 'chat.completion', 'created': int(time.time()),
+                        'model': payload.get('model'),
+                        'choices': [{'index': 0, 'finish_reason': 'stop',
+                                     'message': {'role': 'assistant', 'content': content}}],
+                        'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': 8,
+                                  'total_tokens': prompt_tokens + 8}
+                    })
+                    return
+
+                count = min(fake.answer_tokens, payload.get('max_tokens') or fake.answer_tokens)
+                tokens = [ANSWER_WORDS[i % len(ANSWER_WORDS)] + ' ' for i in range(count)]
+                if '[ROUTE:' in prompt:
+                    route = 'company_check' if fake._has_company(prompt) else 'situation_analysis'
+                    tokens.insert(0, f'[ROUTE: {route}]\n')
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                time.sleep(fake.first_token_latency)
+                for i, token in enumerate(tokens):
+                    if i:
+                        time.sleep(fake.token_latency)
+                    self._send_event({'choices': [{'index': 0, 'delta': {'role': 'assistant', 'content': token},
+                                                   'finish_reason': None}]}, payload)
+                self._send_event({
+                    'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+                    'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': len(tokens),
+                              'total_tokens': prompt_tokens + len(tokens)}
+                }, payload)
+                self.wfile.write(b'data: [DONE]\n\n')
+                self.wfile.flush()
+                self.close_connection = True
+
+            def _send_event(self, chunk, payload):
+                chunk = dict(chunk, id='fake', object='chat.completion.chunk',
+                             created=int(time.time()), model=payload.get('model'))
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--first-token-latency', type=float, default=0.5)
+    parser.add_argument('--token-latency', type=float, default=0.02)
+    parser.add_argument('--embedding-latency', type=float, default=0.05)
+    parser.add_argument('--answer-tokens', type=int, default=120)
+    args = parser.parse_args()
+
+    server = FakeTogetherServer(args.host, args.port, args.first_token_latency, args.token_latency,
+                                args.embedding_latency, args.answer_tokens)
+    print(f"Fake Together server listening at {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
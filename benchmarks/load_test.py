@@ -0,0 +1,337 @@
+"""
+Load test for the Flask endpoints against a local fake Together server.
+
+Replays a mix of /chat, /get-prompts, /get-boilerplate-response and /save-chat
+requests with a growing number of concurrent users, for each gunicorn worker
+configuration, and reports throughput, latency percentiles and the saturation point.
+Like the web interface, a chat message is checked with /get-boilerplate-response
+first and only sent to /chat when there is no canned answer; its latency covers both.
+
+Run from the repository root:
+    python benchmarks/load_test.py --workers 1 2 4 --concurrency 1 2 4 8 16 32 --output report.json
+    python benchmarks/load_test.py --compare report.json --output new_report.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from fake_together_server import FakeTogetherServer
+from shared_memory_benchmark import REPO_ROOT, start_gunicorn, stop_gunicorn
+
+CHAT_MESSAGES = [
+    "I got a call from someone saying they are from Macquarie Bank and asked me to move my savings to a new account",
+    "Watercrest Capital offered me a fixed rate bond paying 9% guaranteed, is this legit?",
+    "Someone on Facebook Marketplace wants to pay me with a PayID and says I need to upgrade my account first",
+    "I received an SMS saying my parcel is held and I need to pay a small fee through a link",
+    "A recruiter on WhatsApp offered me a job liking videos and now wants me to deposit money to unlock my earnings",
+    "Is CommBank sending texts about suspicious logins on my account?",
+    "My friend told me about a crypto trading platform that doubles your money in a month",
+    "I'm not sure if this is a scam, can you help me check if the pattern looks like a scam",
+    "What are the latest scams?",
+    "Hello",
+]
+BOILERPLATE_PROMPTS = [
+    "I heard this good investment opportunity from a company, can you help me to check if any institution has warned about it?",
+    "I heard this good investment opportunity from a company, can you help me check if any institution has warned about it",
+    "I'm not sure if this is a scam, can you help me check if the pattern look like a scam?",
+    "Someone called me about my tax return",
+]
+DEFAULT_MIX = 'chat=0.6,get-prompts=0.15,boilerplate=0.15,save-chat=0.1'
+
+
+def parse_mix(text):
+    """Parse endpoint weights such as 'chat=0.6,get-prompts=0.4'"""
+    mix = {}
+    for item in text.split(','):
+        name, weight = item.split('=')
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}', expected one of {list(ENDPOINTS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def send(base_url, method, path, payload, timeout):
+    """Send one request, returns (ok, parsed JSON body or None)"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            ok = response.status < 400
+    except (urllib.error.URLError, OSError):
+        return False, None
+    try:
+        return ok, json.loads(body)
+    except ValueError:
+        return ok, None
+
+
+def chat_action(base_url, rng, timeout):
+    """
+    Send a chat message the way the web interface does: the boilerplate check first,
+    then /chat only when there is no canned answer
+    """
+    message = rng.choice(CHAT_MESSAGES)
+    ok, data = send(base_url, 'POST', '/get-boilerplate-response', {'prompt': message}, timeout)
+    if not ok:
+        return False
+    if data and data.get('is_boilerplate'):
+        return True
+    ok, _ = send(base_url, 'POST', '/chat', {'message': message, 'boilerplate_checked': True}, timeout)
+    return ok
+
+
+def get_prompts_action(base_url, rng, timeout):
+    return send(base_url, 'GET', '/get-prompts', None, timeout)[0]
+
+
+def boilerplate_action(base_url, rng, timeout):
+    return send(base_url, 'POST', '/get-boilerplate-response', {'prompt': rng.choice(BOILERPLATE_PROMPTS)}, timeout)[0]
+
+
+def save_chat_action(base_url, rng, timeout):
+    history = []
+    for _ in range(rng.randint(1, 4)):
+        history.append({'isUser': True, 'text': rng.choice(CHAT_MESSAGES)})
+        history.append({'isUser': False, 'text': 'Could you tell me more about how they contacted you?'})
+    return send(base_url, 'POST', '/save-chat', {'chatHistory': history}, timeout)[0]
+
+
+# Each action is one user interaction; a chat can take more than one HTTP request
+ENDPOINTS = {
+    'chat': chat_action,
+    'get-prompts': get_prompts_action,
+    'boilerplate': boilerplate_action,
+    'save-chat': save_chat_action,
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_level(base_url, concurrency, mix, duration, warmup, request_timeout, seed):
+    """Run closed-loop users for the given duration and collect per-endpoint latencies"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = []
+    sent_counts = {name: 0 for name in names}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = started + duration
+
+    def user(index):
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            sent = time.perf_counter()
+            ok = ENDPOINTS[name](base_url, rng, request_timeout)
+            finished = time.perf_counter()
+            with lock:
+                sent_counts[name] += 1
+                if sent >= measure_from:
+                    samples.append((name, sent, finished, ok))
+
+    users = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in users:
+        thread.start()
+    for thread in users:
+        thread.join()
+
+    # Latency covers every request sent in the window, including those that finish after it,
+    # while throughput only counts requests completed inside the window
+    window = duration - warmup
+    endpoints = {}
+    for name in names:
+        latencies = [finished - sent for endpoint, sent, finished, ok in samples if endpoint == name and ok]
+        completed = sum(1 for endpoint, _, finished, ok in samples if endpoint == name and ok and finished <= deadline)
+        errors = sum(1 for endpoint, _, _, ok in samples if endpoint == name and not ok)
+        endpoints[name] = {
+            'sent': sent_counts[name],
+            'count': len(latencies),
+            'errors': errors,
+            'throughput_rps': completed / window,
+            'p50_s': percentile(latencies, 0.5),
+            'p90_s': percentile(latencies, 0.9),
+            'p99_s': percentile(latencies, 0.99),
+        }
+    return {
+        'concurrency': concurrency,
+        'throughput_rps': sum(1 for _, _, finished, ok in samples if ok and finished <= deadline) / window,
+        'errors': sum(1 for _, _, _, ok in samples if not ok),
+        'endpoints': endpoints,
+    }
+
+
+def find_saturation(levels, slo, min_gain):
+    """
+    The saturation point is the first concurrency level where /chat p90 exceeds the SLO
+    or where adding users no longer increases throughput by at least min_gain.
+    """
+    peak = max(levels, key=lambda level: level['throughput_rps'])
+    saturation = None
+    previous = None
+    for level in levels:
+        chat_p90 = level['endpoints'].get('chat', {}).get('p90_s')
+        if chat_p90 is not None and chat_p90 > slo:
+            saturation = {'concurrency': level['concurrency'], 'reason': f'chat p90 above {slo}s'}
+            break
+        if previous is not None and level['throughput_rps'] < previous['throughput_rps'] * (1 + min_gain):
+            saturation = {'concurrency': previous['concurrency'], 'reason': 'throughput stopped growing'}
+            break
+        previous = level
+    return {
+        'peak_throughput_rps': peak['throughput_rps'],
+        'peak_concurrency': peak['concurrency'],
+        'saturation': saturation,
+    }
+
+
+def print_levels(config, levels, summary):
+    print(f"\n=== {config['mode']} deployment, {config['workers']} workers x {config['threads']} threads "
+          f"(boot {config['boot_s']:.1f}s) ===")
+    print(f"{'users':>6} {'req/s':>8} {'errors':>7} {'chat p50':>9} {'chat p90':>9} {'chat p99':>9} "
+          f"{'upstream/chat':>14}")
+    for level in levels:
+        chat = level['endpoints'].get('chat', {})
+        fmt = lambda value: f"{value:>9.2f}" if value is not None else f"{'-':>9}"
+        per_chat = level['upstream_chat_calls'] / chat['sent'] if chat.get('sent') else 0
+        print(f"{level['concurrency']:>6} {level['throughput_rps']:>8.2f} {level['errors']:>7} "
+              f"{fmt(chat.get('p50_s'))} {fmt(chat.get('p90_s'))} {fmt(chat.get('p99_s'))} {per_chat:>14.2f}")
+    saturation = summary['saturation']
+    print(f"Peak throughput {summary['peak_throughput_rps']:.2f} req/s at {summary['peak_concurrency']} users, "
+          + (f"saturated at {saturation['concurrency']} users ({saturation['reason']})"
+             if saturation else "not saturated in the tested range"))
+
+
+def compare_reports(previous, current):
+    """Print throughput and /chat p90 changes against a previous report"""
+    def index(report):
+        return {
+            (result['mode'], result['workers'], result['threads'], level['concurrency']): level
+            for result in report['results'] for level in result['levels']
+        }
+
+    before, after = index(previous), index(current)
+    print(f"\n=== Compared with {previous.get('git_commit') or 'previous report'} "
+          f"({previous.get('generated_at', 'unknown date')}) ===")
+    print(f"{'mode':<8} {'workers':>7} {'threads':>7} {'users':>6} {'req/s':>16} {'chat p90 (s)':>18}")
+    for key in sorted(after):
+        if key not in before:
+            continue
+        old, new = before[key], after[key]
+        old_p90 = old['endpoints'].get('chat', {}).get('p90_s')
+        new_p90 = new['endpoints'].get('chat', {}).get('p90_s')
+        p90 = f"{old_p90:.2f} -> {new_p90:.2f}" if old_p90 is not None and new_p90 is not None else '-'
+        print(f"{key[0]:<8} {key[1]:>7} {key[2]:>7} {key[3]:>6} "
+              f"{old['throughput_rps']:>6.2f} -> {new['throughput_rps']:<6.2f} {p90:>18}")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=['default'], choices=['default', 'shared'])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=4, help='threads per gunicorn worker')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--duration', type=float, default=20, help='seconds per concurrency level')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds excluded from each level')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument('--routing-mode', choices=['two_call', 'one_shot'], default='two_call')
+    parser.add_argument('--first-token-latency', type=float, default=0.5, help='fake upstream latency in seconds')
+    parser.add_argument('--token-latency', type=float, default=0.02, help='fake upstream delay between tokens')
+    parser.add_argument('--embedding-latency', type=float, default=0.05)
+    parser.add_argument('--answer-tokens', type=int, default=120)
+    parser.add_argument('--slo', type=float, default=10, help='/chat p90 latency limit in seconds')
+    parser.add_argument('--min-gain', type=float, default=0.05,
+                        help='minimum throughput gain per level before the deployment counts as saturated')
+    parser.add_argument('--request-timeout', type=float, default=120)
+    parser.add_argument('--boot-timeout', type=float, default=120)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--compare', help='previous JSON report to compare against')
+    args = parser.parse_args()
+
+    fake = FakeTogetherServer(first_token_latency=args.first_token_latency, token_latency=args.token_latency,
+                              embedding_latency=args.embedding_latency, answer_tokens=args.answer_tokens).start()
+    # Saved chats go to a throwaway database that is removed after the sweep
+    with tempfile.TemporaryDirectory(prefix='load_test_') as store_dir:
+        env = {
+            'TOGETHER_BASE_URL': fake.base_url,
+            'TOGETHER_API_KEY': 'load-test',
+            'ROUTING_MODE': args.routing_mode,
+            'CHAT_STORE_PATH': os.path.join(store_dir, 'chat_histories.db'),
+        }
+
+        results = []
+        try:
+            for mode in args.modes:
+                for workers in args.workers:
+                    process, port, boot_time = start_gunicorn(
+                        mode, workers, args.boot_timeout, extra_args=['--threads', str(args.threads)], env=env
+                    )
+                    config = {'mode': mode, 'workers': workers, 'threads': args.threads, 'boot_s': boot_time}
+                    levels = []
+                    try:
+                        for concurrency in args.concurrency:
+                            # Upstream completions per /chat request show how many LLM calls each chat costs
+                            upstream_before = fake.requests['chat']
+                            level = run_level(f'http://127.0.0.1:{port}', concurrency, args.mix, args.duration,
+                                              args.warmup, args.request_timeout, args.seed)
+                            level['upstream_chat_calls'] = fake.requests['chat'] - upstream_before
+                            levels.append(level)
+                    finally:
+                        stop_gunicorn(process)
+                    summary = find_saturation(levels, args.slo, args.min_gain)
+                    print_levels(config, levels, summary)
+                    results.append(dict(config, levels=levels, **summary))
+        finally:
+            fake.stop()
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'settings': {
+            'routing_mode': args.routing_mode,
+            'mix': args.mix,
+            'duration_s': args.duration,
+            'warmup_s': args.warmup,
+            'first_token_latency_s': args.first_token_latency,
+            'token_latency_s': args.token_latency,
+            'embedding_latency_s': args.embedding_latency,
+            'answer_tokens': args.answer_tokens,
+            'slo_s': args.slo,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare_reports(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
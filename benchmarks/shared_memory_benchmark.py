@@ -0,0 +1,135 @@
+"""
+Compare worker memory and boot time of the default gunicorn deployment
+against the shared memory deployment (gunicorn_shared.conf.py).
+
+Run from the repository root (Linux only, reads /proc):
+    python benchmarks/shared_memory_benchmark.py --workers 1 2 4 8
+"""
+import argparse
+import collections
+import os
+import queue
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READY_MESSAGE = 'Chatbot initialized successfully!'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def read_kb(path, field):
+    """Read a kB value such as VmRSS or Pss from a /proc status file"""
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except (FileNotFoundError, ProcessLookupError):
+        pass
+    return 0
+
+
+def child_pids(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def start_gunicorn(mode, workers, timeout, extra_args=(), env=None):
+    """Start gunicorn and wait until every worker has booted, returns (process, port, boot time)"""
+    port = free_port()
+    command = [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}']
+    if mode == 'shared':
+        command += ['-c', 'gunicorn_shared.conf.py']
+    else:
+        # Stop gunicorn from picking up a gunicorn.conf.py in the working directory
+        command += ['-c', '/dev/null']
+    command += list(extra_args)
+    command.append('app:app')
+
+    env = dict(os.environ, **(env or {}), PYTHONUNBUFFERED='1')
+    env.setdefault('TOGETHER_API_KEY', 'benchmark')
+    env.setdefault('CHAT_STORE_PATH', os.path.join('chat_histories', 'benchmark.db'))
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=REPO_ROOT, env=env, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, text=True)
+    # Read the output on a thread so a stuck boot cannot block past the timeout
+    lines = queue.Queue()
+    threading.Thread(target=lambda: [lines.put(line) for line in process.stdout], daemon=True).start()
+    recent = collections.deque(maxlen=20)
+    ready = 0
+    while ready < workers:
+        remaining = timeout - (time.perf_counter() - started)
+        try:
+            line = lines.get(timeout=max(remaining, 0))
+        except queue.Empty:
+            break
+        recent.append(line)
+        # Workers share the output pipe, so messages can end up on the same line
+        ready += line.count(READY_MESSAGE)
+    if ready < workers:
+        stop_gunicorn(process)
+        raise RuntimeError(f'{mode} mode with {workers} workers did not boot within {timeout}s:\n'
+                           + ''.join(recent))
+    return process, port, time.perf_counter() - started
+
+
+def stop_gunicorn(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run(mode, workers, timeout):
+    """Start gunicorn with the given number of workers and measure boot time and memory"""
+    process, _, boot_time = start_gunicorn(mode, workers, timeout)
+    try:
+        # Give the workers a moment to settle before sampling memory
+        time.sleep(1)
+        pids = child_pids(process.pid)
+        rss = [read_kb(f'/proc/{pid}/status', 'VmRSS') for pid in pids]
+        pss = [read_kb(f'/proc/{pid}/smaps_rollup', 'Pss') for pid in pids]
+        return {
+            'mode': mode,
+            'workers': workers,
+            'boot_s': boot_time,
+            'rss_per_worker_mb': sum(rss) / len(rss) / 1024 if rss else 0,
+            'pss_per_worker_mb': sum(pss) / len(pss) / 1024 if pss else 0,
+            'master_rss_mb': read_kb(f'/proc/{process.pid}/status', 'VmRSS') / 1024
+        }
+    finally:
+        stop_gunicorn(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--modes', nargs='+', default=['default', 'shared'], choices=['default', 'shared'])
+    parser.add_argument('--timeout', type=float, default=120)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'workers':>7} {'boot (s)':>9} {'RSS/worker (MB)':>16} {'PSS/worker (MB)':>16} {'master RSS (MB)':>16}")
+    for workers in args.workers:
+        for mode in args.modes:
+            result = run(mode, workers, args.timeout)
+            print(f"{result['mode']:<8} {result['workers']:>7} {result['boot_s']:>9.2f} "
+                  f"{result['rss_per_worker_mb']:>16.1f} {result['pss_per_worker_mb']:>16.1f} "
+                  f"{result['master_rss_mb']:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class ChatStore:
+    """
+    Append-only conversation store backed by SQLite in WAL mode.
+    Writes are queued and committed in batches by a background thread so
+    requests never wait on disk, and old conversations are pruned periodically.
+    """
+
+    def __init__(self, path='chat_histories/chat_histories.db', retention_days=30,
+                 batch_size=100, flush_interval=1.0, compact_interval=3600):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+        self._queue = queue.Queue()
+        self._local = threading.local()
+        self._create_schema()
+        self._writer = threading.Thread(target=self._write_loop, name='chat-store-writer', daemon=True)
+        self._writer.start()
+        # The writer is a daemon thread, so write out what is still queued before the process exits
+        atexit.register(self.flush, timeout=10)
+
+    def _connect(self):
+        """Return a connection for the calling thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+                conversation_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                is_user INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (conversation_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_conversations_created_at ON conversations(created_at);
+        """)
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts
+                USING fts5(text, conversation_id UNINDEXED)
+            """)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, search falls back to LIKE
+            self.has_fts = False
+        conn.commit()
+
+    def append(self, messages):
+        """Queue a conversation of (is_user, text) pairs for writing and return its id"""
+        conversation_id = uuid.uuid4().hex
+        self._queue.put((conversation_id, time.time(), list(messages)))
+        return conversation_id
+
+    def _write_loop(self):
+        last_compact = time.time()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.time())))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"Chat store batch write error: {str(e)}")
+                # Write the conversations one at a time so a bad one doesn't take the rest with it
+                for item in batch:
+                    try:
+                        self._write_batch([item])
+                    except Exception as e:
+                        print(f"Chat store write error for conversation {item[0]}: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if time.time() - last_compact >= self.compact_interval:
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"Chat store compaction error: {str(e)}")
+                last_compact = time.time()
+
+    def _write_batch(self, batch):
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'INSERT INTO conversations (id, created_at) VALUES (?, ?)',
+                [(conversation_id, created_at) for conversation_id, created_at, _ in batch]
+            )
+            rows = [
+                (conversation_id, position, int(is_user), text)
+                for conversation_id, _, messages in batch
+                for position, (is_user, text) in enumerate(messages)
+            ]
+            conn.executemany(
+                'INSERT INTO messages (conversation_id, position, is_user, text) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            if self.has_fts:
+                conn.executemany(
+                    'INSERT INTO messages_fts (text, conversation_id) VALUES (?, ?)',
+                    [(text, conversation_id) for conversation_id, _, _, text in rows]
+                )
+
+    def flush(self, timeout=None):
+        """
+        Block until all queued conversations have been written
+        Returns False if the timeout expired first
+        """
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def compact(self):
+        """Drop conversations past the retention window and reclaim WAL space"""
+        conn = self._connect()
+        cutoff = time.time() - self.retention_days * 86400
+        with conn:
+            expired = 'SELECT id FROM conversations WHERE created_at < ?'
+            if self.has_fts:
+                conn.execute(f'DELETE FROM messages_fts WHERE conversation_id IN ({expired})', (cutoff,))
+            conn.execute(f'DELETE FROM messages WHERE conversation_id IN ({expired})', (cutoff,))
+            conn.execute('DELETE FROM conversations WHERE created_at < ?', (cutoff,))
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def iter_messages(self, conversation_id):
+        """Yield (is_user, text) pairs of a stored conversation in order"""
+        cursor = self._connect().execute(
+            'SELECT is_user, text FROM messages WHERE conversation_id = ? ORDER BY position',
+            (conversation_id,)
+        )
+        for is_user, text in cursor:
+            yield bool(is_user), text
+
+    def search(self, query, limit=20):
+        """Return ids of the most recent conversations containing the query text"""
+        conn = self._connect()
+        if self.has_fts:
+            phrase = '"' + query.replace('"', '""') + '"'
+            cursor = conn.execute("""
+                SELECT c.id, c.created_at FROM conversations c
+                WHERE c.id IN (SELECT conversation_id FROM messages_fts WHERE messages_fts MATCH ?)
+                ORDER BY c.created_at DESC LIMIT ?
+            """, (phrase, limit))
+        else:
+            cursor = conn.execute("""
+                SELECT c.id, c.created_at FROM conversations c
+                WHERE c.id IN (SELECT conversation_id FROM messages WHERE text LIKE ?)
+                ORDER BY c.created_at DESC LIMIT ?
+            """, (f'%{query}%', limit))
+        return [{'id': conversation_id, 'created_at': created_at} for conversation_id, created_at in cursor]
+
+
+def normalize_chat_history(chat_history):
+    """
+    Convert the chat history sent by the frontend into (is_user, text) pairs
+    Raises ValueError if a message is malformed
+    """
+    if not isinstance(chat_history, list):
+        raise ValueError("chatHistory must be a list of messages")
+    messages = []
+    for message in chat_history:
+        if not isinstance(message, dict) or 'isUser' not in message or not isinstance(message.get('text'), str):
+            raise ValueError("Each message needs an 'isUser' flag and a 'text' string")
+        try:
+            message['text'].encode('utf-8')
+        except UnicodeEncodeError:
+            # Lone surrogates survive JSON decoding but cannot be stored
+            raise ValueError("Message text must be valid Unicode")
+        messages.append((bool(message['isUser']), message['text']))
+    return messages
+
+
+def format_chat_history(messages):
+    """Yield the plain text export of a conversation, one message at a time"""
+    for is_user, text in messages:
+        role = "User" if is_user else "Bot"
+        yield f"{role}: {text}\n\n"
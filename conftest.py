@@ -0,0 +1,7 @@
+# Lets pytest import the top-level modules (app, fast_answer, ...) from the repository root
+import os
+import tempfile
+
+# Importing app builds the module level chatbot and chat store, keep those out of the repo
+os.environ.setdefault('TOGETHER_API_KEY', 'test')
+os.environ.setdefault('CHAT_STORE_PATH', os.path.join(tempfile.mkdtemp(prefix='scam_chatbot_tests_'), 'chats.db'))
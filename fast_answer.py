@@ -0,0 +1,166 @@
+import json
+import re
+import threading
+import time
+from difflib import SequenceMatcher
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+
+def normalize_text(text):
+    """Lowercase and strip punctuation so near-identical prompts compare equal"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+
+
+def _adds_words(query, prompt):
+    """True if the normalized query has a word that is not a close variant of a prompt word"""
+    prompt_words = set(prompt.split())
+    for word in set(query.split()) - prompt_words:
+        if not any(SequenceMatcher(None, word, known).ratio() >= 0.8 for known in prompt_words):
+            return True
+    return False
+
+
+class FastAnswerTier:
+    """
+    Answers canned intents without calling the LLM.
+    A query is first compared to the suggested prompts with a near-exact fuzzy string match,
+    then to the intent examples with the same embedding model used for retrieval. Only
+    high-confidence matches are answered here, everything else falls through to the routing agent.
+    """
+
+    def __init__(self, chatbot, intents_path='Data/canned_intents.json',
+                 fuzzy_threshold=0.97, semantic_threshold=0.92, alert_count=3):
+        self.chatbot = chatbot
+        self.fuzzy_threshold = fuzzy_threshold
+        self.semantic_threshold = semantic_threshold
+        self.alert_count = alert_count
+        with open(intents_path, 'r', encoding='utf-8') as f:
+            self.intents = json.load(f)['intents']
+        # Suggested prompts shown by /get-prompts, the only targets of the fuzzy match
+        self.prompts = [intent['prompt'] for intent in self.intents if 'prompt' in intent]
+        self._prompts = [
+            (intent, normalize_text(intent['prompt']))
+            for intent in self.intents if 'prompt' in intent
+        ]
+        # Suggested prompts are left out of the embedding match, since a question that
+        # also names a company would still look semantically close to them
+        self._examples = [
+            (intent, example)
+            for intent in self.intents
+            for example in intent.get('examples', [])
+        ]
+        # Words of all examples of each intent, a semantic hit may not add words outside them
+        self._example_words = {
+            intent['id']: ' '.join(normalize_text(example) for example in intent.get('examples', []))
+            for intent in self.intents
+        }
+        self._example_embeddings = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "lookups": 0,
+            "fuzzy_hits": 0,
+            "semantic_hits": 0,
+            "total_lookup_s": 0.0,
+            "intents": {intent['id']: 0 for intent in self.intents}
+        }
+
+    def _get_example_embeddings(self):
+        """Embed the intent examples once, on first use"""
+        with self._lock:
+            if self._example_embeddings is None:
+                response = self.chatbot.client.embeddings.create(
+                    model="togethercomputer/m2-bert-80M-2k-retrieval",
+                    input=[example for _, example in self._examples]
+                )
+                self._example_embeddings = np.array([item.embedding for item in response.data])
+            return self._example_embeddings
+
+    def _fuzzy_match(self, query):
+        normalized = normalize_text(query)
+        best_intent, best_score = None, 0.0
+        for intent, prompt in self._prompts:
+            # A query that adds words, such as a company name, is a real question and not the canned prompt
+            if _adds_words(normalized, prompt):
+                continue
+            score = SequenceMatcher(None, normalized, prompt).ratio()
+            if score > best_score:
+                best_intent, best_score = intent, score
+        if best_score >= self.fuzzy_threshold:
+            return best_intent
+        return None
+
+    def _semantic_match(self, query):
+        if not self._examples:
+            return None
+        try:
+            example_embeddings = self._get_example_embeddings()
+            # The embedding is cached on the chatbot, so retrieval reuses it on a miss
+            query_embedding = self.chatbot.get_embedding(query)
+        except Exception as e:
+            print(f"Fast answer embedding error: {str(e)}")
+            return None
+        similarities = cosine_similarity([query_embedding], example_embeddings)[0]
+        best = int(np.argmax(similarities))
+        intent = self._examples[best][0]
+        if similarities[best] < intent.get('threshold', self.semantic_threshold):
+            return None
+        # Asking about the latest scams of a named company is still close in embedding space,
+        # but it is a real question and not the canned intent
+        if _adds_words(normalize_text(query), self._example_words[intent['id']]):
+            return None
+        return intent
+
+    def _render(self, intent, query):
+        """Fill the intent template, adding the top retrieved alert titles if requested"""
+        template = intent['response']
+        if '{alert_titles}' not in template:
+            return template
+        relevant_info = self.chatbot.find_relevant_content(query, top_k=self.alert_count)
+        titles = '\n'.join(f"- {title}" for title in relevant_info['Title'].tolist())
+        return template.replace('{alert_titles}', titles)
+
+    def answer(self, query, fuzzy=True, semantic=True, count_lookup=True):
+        """
+        Return a templated answer for a high-confidence intent match, or None.
+        Pass count_lookup=False when the same message was already counted by an earlier check.
+        """
+        started = time.perf_counter()
+        intent = self._fuzzy_match(query) if fuzzy else None
+        kind = 'fuzzy_hits'
+        if intent is None and semantic:
+            intent = self._semantic_match(query)
+            kind = 'semantic_hits'
+
+        response = None
+        if intent is not None:
+            try:
+                response = self._render(intent, query)
+            except Exception as e:
+                print(f"Fast answer render error: {str(e)}")
+
+        with self._lock:
+            if count_lookup:
+                self.stats["lookups"] += 1
+            self.stats["total_lookup_s"] += time.perf_counter() - started
+            if response is not None:
+                self.stats[kind] += 1
+                self.stats["intents"][intent['id']] += 1
+        if response is not None:
+            print(f"\n✓ Fast answer: {intent['id']}")
+        return response
+
+    def get_stats(self, llm_latency_s=0.0):
+        """Return hit rate and the estimated latency saved against the LLM path"""
+        with self._lock:
+            hits = self.stats["fuzzy_hits"] + self.stats["semantic_hits"]
+            lookups = self.stats["lookups"] or 1
+            return dict(
+                self.stats,
+                intents=dict(self.stats["intents"]),
+                hits=hits,
+                hit_rate=hits / lookups,
+                avg_lookup_s=self.stats["total_lookup_s"] / lookups,
+                latency_saved_s=hits * llm_latency_s
+            )
@@ -0,0 +1,34 @@
+# Gunicorn config for the shared memory deployment mode:
+#   gunicorn -c gunicorn_shared.conf.py app:app
+# The master process loads the scam alerts and embeddings once and publishes
+# them to shared memory, workers attach read-only instead of parsing the CSVs.
+import os
+import sys
+
+from shared_store import SHARED_STORE_ENV, SharedAlertStore
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+timeout = 120
+
+_store = None
+
+
+def on_starting(server):
+    global _store
+    _store = SharedAlertStore.publish()
+    # Workers inherit the environment of the master process
+    os.environ[SHARED_STORE_ENV] = _store.prefix
+
+
+def on_exit(server):
+    if _store is not None:
+        _store.close()
+
+
+def worker_exit(server, worker):
+    # Workers leave through os._exit, which skips atexit, so write out queued chats here
+    app = sys.modules.get('app')
+    if app is not None:
+        app.chat_store.flush(timeout=10)
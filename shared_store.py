@@ -0,0 +1,148 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+# Shared memory segments published by the loader process
+SHARED_STORE_ENV = 'SCAM_CHATBOT_SHARED_STORE'
+HEADER_SIZE = 4096
+
+
+def load_alert_store(alerts_path='Data/scam_alerts.csv', embeddings_path='Data/scam_alerts_embeddings.csv'):
+    """Parse the scam alerts and their embeddings from the CSV files"""
+    scam_data = pd.read_csv(alerts_path)
+    embeddings_data = pd.read_csv(embeddings_path)
+    # Convert string representation of embeddings back to numpy arrays
+    embeddings_data['embedding'] = embeddings_data['embedding'].apply(json.loads)
+    embeddings_matrix = np.array(embeddings_data['embedding'].tolist(), dtype=np.float32)
+    return scam_data, embeddings_data[['Intel_ID']], embeddings_matrix
+
+
+def _segment_name(prefix, part):
+    return f"{prefix}_{part}"
+
+
+def _attach(name):
+    """Attach to an existing segment without taking ownership of it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older versions always register the segment with the resource tracker.
+    # Forked workers share the tracker of the process that published the
+    # segment, so registering it again is a no-op there.
+    return shared_memory.SharedMemory(name=name)
+
+
+def _encode_columns(alerts):
+    """
+    Lay out each alert column as int64 offsets followed by the UTF-8 text they index.
+    Returns the column specs for the header and the bytes of the alerts segment.
+    """
+    specs = []
+    parts = []
+    position = 0
+    for column in alerts.columns:
+        values = [b'' if pd.isna(value) else str(value).encode('utf-8') for value in alerts[column]]
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(value) for value in values])
+        data = b''.join(values)
+        # Keep every offsets array 8-byte aligned
+        padding = -position % 8
+        parts.append(b'\x00' * padding)
+        position += padding
+        specs.append({
+            'name': column,
+            'offsets_start': position,
+            'data_start': position + offsets.nbytes,
+            'data_size': len(data)
+        })
+        parts += [offsets.tobytes(), data]
+        position += offsets.nbytes + len(data)
+    return specs, b''.join(parts)
+
+
+class SharedAlertStore:
+    """
+    Alert store and embedding matrix published once into shared memory.
+    The loader calls publish() and keeps the returned store alive, workers call
+    attach() and read the alerts in place instead of parsing the CSVs themselves.
+    Alert rows are aligned with the rows of the embedding matrix.
+    """
+
+    def __init__(self, prefix, segments, header, owner=False):
+        self.prefix = prefix
+        self._segments = segments
+        self.owner = owner
+        self.embeddings_matrix = np.ndarray(tuple(header['shape']), dtype=np.dtype(header['dtype']),
+                                            buffer=segments['matrix'].buf)
+        self.embeddings_matrix.flags.writeable = False
+        # Zero-copy views of each column: offsets array and the UTF-8 text it indexes
+        rows = header['shape'][0]
+        buf = segments['alerts'].buf
+        self._columns = {}
+        for spec in header['columns']:
+            offsets = np.ndarray((rows + 1,), dtype=np.int64, buffer=buf, offset=spec['offsets_start'])
+            offsets.flags.writeable = False
+            data = buf[spec['data_start']:spec['data_start'] + spec['data_size']]
+            self._columns[spec['name']] = (offsets, data)
+
+    def __len__(self):
+        return self.embeddings_matrix.shape[0]
+
+    def take(self, indices):
+        """Return the alerts at the given row indices as a small DataFrame"""
+        indices = [int(i) for i in indices]
+        return pd.DataFrame({
+            name: [bytes(data[offsets[i]:offsets[i + 1]]).decode('utf-8') for i in indices]
+            for name, (offsets, data) in self._columns.items()
+        }, index=indices)
+
+    @classmethod
+    def publish(cls, prefix=None, **paths):
+        """Load the alert store and copy it into new shared memory segments"""
+        prefix = prefix or f"scam_chatbot_{os.getpid()}"
+        scam_data, embeddings_data, embeddings_matrix = load_alert_store(**paths)
+        # Align the alerts with the embedding rows so a similarity index is also an alert index
+        alerts = embeddings_data.merge(scam_data.drop_duplicates('Intel_ID'), on='Intel_ID', how='left')
+        specs, alerts_bytes = _encode_columns(alerts[scam_data.columns])
+        header = {
+            'shape': list(embeddings_matrix.shape),
+            'dtype': embeddings_matrix.dtype.str,
+            'columns': specs
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+        if len(header_bytes) > HEADER_SIZE:
+            raise ValueError(f"Shared store header is {len(header_bytes)} bytes, limit is {HEADER_SIZE}")
+
+        segments = {
+            'header': shared_memory.SharedMemory(name=_segment_name(prefix, 'header'), create=True, size=HEADER_SIZE),
+            'matrix': shared_memory.SharedMemory(name=_segment_name(prefix, 'matrix'), create=True, size=max(embeddings_matrix.nbytes, 1)),
+            'alerts': shared_memory.SharedMemory(name=_segment_name(prefix, 'alerts'), create=True, size=max(len(alerts_bytes), 1))
+        }
+        segments['header'].buf[:len(header_bytes)] = header_bytes
+        segments['matrix'].buf[:embeddings_matrix.nbytes] = embeddings_matrix.tobytes()
+        segments['alerts'].buf[:len(alerts_bytes)] = alerts_bytes
+        print(f"Published alert store to shared memory '{prefix}' "
+              f"({embeddings_matrix.nbytes} bytes of embeddings, {len(alerts_bytes)} bytes of alerts)")
+        return cls(prefix, segments, header, owner=True)
+
+    @classmethod
+    def attach(cls, prefix):
+        """Attach read-only to an alert store published by the loader process"""
+        segments = {part: _attach(_segment_name(prefix, part)) for part in ('header', 'matrix', 'alerts')}
+        header = json.loads(bytes(segments['header'].buf).rstrip(b'\x00').decode('utf-8'))
+        return cls(prefix, segments, header)
+
+    def close(self):
+        """Detach from the segments, and remove them if this process published them"""
+        # Views into the buffers must be released before the segments can be closed
+        self.embeddings_matrix = None
+        for offsets, data in self._columns.values():
+            data.release()
+        self._columns = {}
+        for segment in self._segments.values():
+            segment.close()
+            if self.owner:
+                segment.unlink()
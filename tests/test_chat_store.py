@@ -0,0 +1,101 @@
+import pytest
+
+from chat_store import ChatStore, format_chat_history, normalize_chat_history
+
+CONVERSATION = [
+    (True, "Is Acme Capital legit?"),
+    (False, "According to my records Acme Capital was flagged by ASIC."),
+    (True, "Thanks"),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ChatStore(path=str(tmp_path / 'chats.db'), flush_interval=0.05)
+
+
+def count(store, table, conversation_id=None):
+    if conversation_id is None:
+        return store._connect().execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    column = 'id' if table == 'conversations' else 'conversation_id'
+    return store._connect().execute(
+        f'SELECT COUNT(*) FROM {table} WHERE {column} = ?', (conversation_id,)
+    ).fetchone()[0]
+
+
+def test_appended_conversation_is_read_back_in_order(store):
+    conversation_id = store.append(CONVERSATION)
+    assert store.flush(timeout=5)
+    assert list(store.iter_messages(conversation_id)) == CONVERSATION
+    assert ''.join(format_chat_history(store.iter_messages(conversation_id))).startswith(
+        "User: Is Acme Capital legit?\n\nBot: According to my records"
+    )
+
+
+@pytest.mark.parametrize('has_fts', [True, False])
+def test_search_finds_conversations_containing_text(store, has_fts):
+    if has_fts and not store.has_fts:
+        pytest.skip("SQLite built without FTS5")
+    store.has_fts = has_fts
+    first = store.append(CONVERSATION)
+    second = store.append([(True, "They promised guaranteed returns")])
+    store.flush(timeout=5)
+
+    assert [result['id'] for result in store.search("Acme Capital")] == [first]
+    assert [result['id'] for result in store.search("guaranteed")] == [second]
+    assert store.search("nothing like this") == []
+
+
+def test_compact_removes_expired_conversations_from_every_table(store):
+    expired = store.append(CONVERSATION)
+    store.flush(timeout=5)
+    store._connect().execute('UPDATE conversations SET created_at = created_at - ? WHERE id = ?',
+                             ((store.retention_days + 1) * 86400, expired))
+    store._connect().commit()
+    kept = store.append(CONVERSATION)
+    store.flush(timeout=5)
+
+    store.compact()
+
+    tables = ['conversations', 'messages'] + (['messages_fts'] if store.has_fts else [])
+    for table in tables:
+        assert count(store, table, expired) == 0
+        assert count(store, table, kept) > 0
+    assert list(store.iter_messages(kept)) == CONVERSATION
+
+
+def test_failed_conversation_does_not_drop_rest_of_batch(store):
+    # Bypasses normalize_chat_history, so the lone surrogate reaches SQLite and fails to encode
+    ids = [
+        store.append(CONVERSATION),
+        store.append([(True, "bad \ud800 text")]),
+        store.append([(True, "Another chat")]),
+    ]
+    assert store.flush(timeout=5)
+    assert count(store, 'conversations') == 2
+    assert list(store.iter_messages(ids[0])) == CONVERSATION
+    assert list(store.iter_messages(ids[1])) == []
+    assert list(store.iter_messages(ids[2])) == [(True, "Another chat")]
+
+
+def test_normalize_chat_history_converts_frontend_messages():
+    assert normalize_chat_history([
+        {'isUser': True, 'text': 'Hi'},
+        {'isUser': False, 'text': 'Hello'},
+    ]) == [(True, 'Hi'), (False, 'Hello')]
+
+
+@pytest.mark.parametrize('chat_history', [
+    None,
+    "User: Hi",
+    {'isUser': True, 'text': 'Hi'},
+    ["Hi"],
+    [{'text': 'Hi'}],
+    [{'isUser': True}],
+    [{'isUser': True, 'text': None}],
+    [{'isUser': True, 'text': ['Hi']}],
+    [{'isUser': True, 'text': 'bad \ud800 text'}],
+])
+def test_normalize_chat_history_rejects_malformed_input(chat_history):
+    with pytest.raises(ValueError):
+        normalize_chat_history(chat_history)
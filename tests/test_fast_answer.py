@@ -0,0 +1,92 @@
+import os
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from fast_answer import FastAnswerTier
+
+INTENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Data', 'canned_intents.json')
+COMPANY_PROMPT = ("I heard this good investment opportunity from a company, "
+                  "can you help me to check if any institution has warned about it?")
+
+
+@pytest.fixture
+def tier():
+    # The fuzzy tier never touches the chatbot, so no Together client is needed
+    return FastAnswerTier(None, intents_path=INTENTS_PATH)
+
+
+@pytest.mark.parametrize('query', [
+    COMPANY_PROMPT,
+    "I heard this good investment opportunity from a company can you help me to check if any institution has warned about it",
+    "i heard this good investment opportunity from a company, can you help me to check if any institution has warned about it",
+])
+def test_suggested_prompt_variants_get_canned_answer(tier, query):
+    assert tier.answer(query, semantic=False) == "Sure, would you be able to tell the name of the company?"
+
+
+@pytest.mark.parametrize('query', [
+    "Has anyone warned about Acme Investment company?",
+    "Has anyone warned about the ASIC investment company?",
+    "I heard this good investment opportunity from Acme Capital, can you help me to check if any institution has warned about it?",
+    "I heard this good investment opportunity from a company called Acme, can you help me to check if any institution has warned about it?",
+    "I'm not sure if this is a scam from Watercrest Capital, can you help me check if the pattern look like a scam?",
+])
+def test_questions_naming_a_company_fall_through(tier, query):
+    assert tier.answer(query, semantic=False) is None
+
+
+def test_prompts_come_from_intent_library(tier):
+    assert COMPANY_PROMPT in tier.prompts
+
+
+def test_already_checked_message_is_not_counted_twice(tier):
+    tier.answer("Is Acme Capital a scam?", semantic=False)
+    tier.answer("Is Acme Capital a scam?", fuzzy=False, semantic=False, count_lookup=False)
+    assert tier.get_stats()['lookups'] == 1
+
+
+class FakeChatbot:
+    """Embeds every text to the same vector, so only the word guard can reject a semantic match"""
+
+    def __init__(self):
+        self.client = SimpleNamespace(embeddings=SimpleNamespace(create=self._embed))
+
+    def _embed(self, model, input):
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[1.0, 0.0]) for _ in input])
+
+    def get_embedding(self, text):
+        return [1.0, 0.0]
+
+    def find_relevant_content(self, query, top_k=5):
+        return pd.DataFrame({'Title': [f"Alert {i}" for i in range(top_k)]})
+
+
+@pytest.fixture
+def semantic_tier():
+    return FastAnswerTier(FakeChatbot(), intents_path=INTENTS_PATH)
+
+
+@pytest.mark.parametrize('query', [
+    "What are the latest scams involving Watercrest Capital?",
+    "Show me recent scam alerts about Acme",
+    "Hi, is Acme Capital a scam?",
+])
+def test_semantic_match_rejects_questions_that_add_words(semantic_tier, query):
+    assert semantic_tier.answer(query, fuzzy=False) is None
+
+
+def test_semantic_match_answers_rephrased_example(semantic_tier):
+    response = semantic_tier.answer("What are the recent scam alerts?", fuzzy=False)
+    assert response.startswith("Here are some related scam alerts from my records:\n- Alert 0\n- Alert 1\n- Alert 2")
+    assert semantic_tier.get_stats()['semantic_hits'] == 1
+
+
+@pytest.mark.parametrize('payload', [{}, {'prompt': None}, {'prompt': 42}, {'prompt': ['Hi']}])
+def test_boilerplate_route_ignores_non_string_prompt(payload):
+    from app import app
+
+    response = app.test_client().post('/get-boilerplate-response', json=payload)
+    assert response.status_code == 200
+    assert response.get_json() == {'is_boilerplate': False}
@@ -0,0 +1,128 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app import COMPANY_FOCUS, LEGITIMACY_FACTORS, SITUATION_FOCUS, RoutingAgent
+
+
+def chunk(content, total_tokens=None):
+    """A streamed completion chunk shaped like the ones the Together SDK yields"""
+    usage = SimpleNamespace(total_tokens=total_tokens) if total_tokens else None
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))], usage=usage)
+
+
+def stream(*contents, total_tokens=42):
+    chunks = [chunk(content) for content in contents]
+    chunks.append(chunk(None, total_tokens=total_tokens))
+    return iter(chunks)
+
+
+class FakeChatbot:
+    """Records the prompts sent to the LLM and answers with a canned stream"""
+
+    def __init__(self, reply=('[ROUTE: situation_analysis]\n', 'Answer')):
+        self.system_message = {"role": "system", "content": "system"}
+        self.extra_knowledge = "EXTRA KNOWLEDGE"
+        self.requests = []
+        self.reply = reply
+        self.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=self._create)))
+
+    def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        return stream(*self.reply)
+
+    def find_relevant_content(self, query, top_k=5):
+        return pd.DataFrame(columns=['Source', 'Title', 'Content'])
+
+
+@pytest.fixture
+def agent():
+    return RoutingAgent(None, mode='one_shot')
+
+
+def one_shot(agent, *contents):
+    return list(agent._strip_route_tag(stream(*contents), 0.0))
+
+
+@pytest.mark.parametrize('contents, route', [
+    (['[ROUTE: company_check]\n', 'Acme is listed.'], 'company_check'),
+    (['[ROU', 'TE: company', '_check]', '\nAcme is listed.'], 'company_check'),
+    (['**[ROUTE: company_check]**\n\n', 'Acme is listed.'], 'company_check'),
+    (['Sure. [ROUTE:company_check] ', 'Acme is listed.'], 'company_check'),
+])
+def test_route_tag_is_stripped(agent, contents, route):
+    text = ''.join(one_shot(agent, *contents))
+    assert 'ROUTE' not in text
+    assert text.endswith('Acme is listed.')
+    stats = agent.get_stats()['one_shot']
+    assert stats['routes'][route] == 1
+    assert stats['requests'] == 1
+    assert stats['llm_calls'] == 1
+    assert stats['total_tokens'] == 42
+
+
+def test_preamble_before_tag_is_kept(agent):
+    assert ''.join(one_shot(agent, 'Sure. ', '[ROUTE: situation_analysis]', ' This looks risky.')) \
+        == 'Sure.  This looks risky.'
+    assert agent.get_stats()['one_shot']['routes']['situation_analysis'] == 1
+
+
+def test_untagged_reply_is_passed_through(agent):
+    words = ['This ', 'could ', 'be ', 'a ', 'scam. '] * 10
+    assert ''.join(one_shot(agent, *words)) == ''.join(words)
+    assert agent.get_stats()['one_shot']['routes']['untagged'] == 1
+
+
+def test_short_untagged_reply_is_flushed_at_end(agent):
+    assert one_shot(agent, 'Be careful.') == ['Be careful.']
+    assert agent.get_stats()['one_shot']['routes']['untagged'] == 1
+
+
+def test_tag_only_reply_yields_nothing(agent):
+    assert one_shot(agent, '[ROUTE: company_check]', '\n') == []
+    stats = agent.get_stats()['one_shot']
+    assert stats['routes']['company_check'] == 1
+    assert stats['requests'] == 1
+
+
+def test_stats_are_recorded_only_when_stream_completes(agent):
+    replies = agent._strip_route_tag(stream('[ROUTE: company_check]\n', 'Acme ', 'is listed.'), 0.0)
+    assert next(replies) == 'Acme '
+    assert agent.get_stats()['one_shot']['requests'] == 0
+    replies.close()
+    stats = agent.get_stats()['one_shot']
+    assert stats['requests'] == 0
+    assert stats['llm_calls'] == 0
+    assert stats['total_tokens'] == 0
+
+
+def test_iter_text_records_two_call_stats(agent):
+    text = list(agent._iter_text(stream('Hello', ' there'), 'two_call', 'situation_analysis', 0.0,
+                                 llm_calls=2, tokens=10))
+    assert text == ['Hello', ' there']
+    stats = agent.get_stats()['two_call']
+    assert stats['requests'] == 1
+    assert stats['llm_calls'] == 2
+    assert stats['total_tokens'] == 52
+    assert stats['avg_llm_calls'] == 2
+    assert stats['routes']['situation_analysis'] == 1
+    assert agent.get_stats()['one_shot']['requests'] == 0
+
+
+def test_prompts_share_focus_and_legitimacy_factors():
+    chatbot = FakeChatbot()
+    agent = RoutingAgent(chatbot)
+    agent._handle_company_query('Is Acme legit?')
+    agent._handle_situation_query('They promised guaranteed returns')
+    list(agent.route_query_one_shot('They promised guaranteed returns'))
+    company, situation, combined = [request['messages'][1]['content'] for request in chatbot.requests]
+
+    assert COMPANY_FOCUS in company and LEGITIMACY_FACTORS in company
+    assert SITUATION_FOCUS in situation and LEGITIMACY_FACTORS in situation
+    assert all(part in combined for part in (COMPANY_FOCUS, SITUATION_FOCUS, LEGITIMACY_FACTORS))
+    # Extra knowledge only goes to the situation route, in one-shot it sits under those instructions
+    assert 'EXTRA KNOWLEDGE' not in company
+    assert 'EXTRA KNOWLEDGE' in situation
+    situation_block = combined[combined.index('If the route is situation_analysis'):combined.index('Key legitimacy factors')]
+    assert 'EXTRA KNOWLEDGE' in situation_block
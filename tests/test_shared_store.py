@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pytest
+
+from shared_store import SharedAlertStore, load_alert_store
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = {
+    'alerts_path': os.path.join(REPO_ROOT, 'Data', 'scam_alerts.csv'),
+    'embeddings_path': os.path.join(REPO_ROOT, 'Data', 'scam_alerts_embeddings.csv'),
+}
+
+
+@pytest.fixture
+def published():
+    store = SharedAlertStore.publish(prefix=f"scam_chatbot_test_{os.getpid()}", **PATHS)
+    yield store
+    store.close()
+
+
+def test_attached_store_matches_csv_rows(published):
+    scam_data, embeddings_data, embeddings_matrix = load_alert_store(**PATHS)
+    attached = SharedAlertStore.attach(published.prefix)
+    try:
+        indices = [0, 5, len(attached) - 1]
+        intel_ids = embeddings_data.iloc[indices]['Intel_ID'].tolist()
+        expected = scam_data[scam_data['Intel_ID'].isin(intel_ids)].astype(str)
+        assert attached.take(indices).values.tolist() == expected.values.tolist()
+        assert np.array_equal(attached.embeddings_matrix, embeddings_matrix)
+    finally:
+        attached.close()
+
+
+def test_attached_views_are_read_only(published):
+    attached = SharedAlertStore.attach(published.prefix)
+    try:
+        with pytest.raises(ValueError):
+            attached.embeddings_matrix[0, 0] = 1.0
+    finally:
+        attached.close()